@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -16,6 +16,20 @@ class SchedulingConfig:
     CROSSOVER_PROBABILITY: float = 0.7
     MUTATION_PROBABILITY: float = 0.3
 
+    # Early Stopping (stop once the best penalty has moved less than the
+    # tolerance over this many generations; None disables the stagnation
+    # check, a penalty of 0 still stops the run)
+    EARLY_STOP_PATIENCE: Optional[int] = 20
+    EARLY_STOP_TOLERANCE: float = 1e-9
+
+    # Parallel Evaluation (worker processes for fitness evaluation; None or 1
+    # evaluates in the main process, which is faster unless evaluations are
+    # expensive enough to outweigh sending chromosomes to the workers)
+    EVALUATION_WORKERS: Optional[int] = None
+
+    # Fitness Memoization (None keeps 4 x POPULATION_SIZE entries, 0 disables)
+    FITNESS_CACHE_SIZE: Optional[int] = None
+
     # Constraint Weights
     HARD_CONSTRAINT_PENALTY: int = 1000
     SOFT_CONSTRAINT_PENALTY: int = 1
@@ -92,6 +106,9 @@ class SchedulingConfig:
         if cls.MAX_GENERATIONS < 1:
             raise ValueError("Maximum generations must be at least 1")
 
+        if cls.EARLY_STOP_PATIENCE is not None and cls.EARLY_STOP_PATIENCE < 2:
+            raise ValueError("Early stop patience must be at least 2 generations")
+
     @classmethod
     def get_configuration(cls) -> dict:
         """
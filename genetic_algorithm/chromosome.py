@@ -1,22 +1,136 @@
-from dataclasses import dataclass, field
-from typing import List, Dict
-from tabulate import tabulate
+import hashlib
+from typing import List, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+from deap import base, creator
 
 from .gene import Gene
+from models.timeslot import DAY_INDEX
+
+# Reverse of DAY_INDEX: day index -> day name.
+DAYS = tuple(DAY_INDEX)
+
+# Genes organized by group id, then day name.
+Timetable = Dict[int, Dict[str, List[Gene]]]
+
+
+class GeneArrays(NamedTuple):
+    """
+    Struct-of-arrays view of a chromosome, one int32 array per gene attribute.
+
+    The day of each gene is encoded through ``DAY_INDEX``.
+    """
+
+    group_ids: np.ndarray
+    day_idx: np.ndarray
+    periods: np.ndarray
+    timeslot_ids: np.ndarray
+    course_ids: np.ndarray
+    teacher_ids: np.ndarray
+    room_ids: np.ndarray
 
 
-@dataclass
 class Chromosome:
     """
     Represents a complete timetable solution composed of multiple genes.
 
-    Provides methods for manipulating and analyzing the timetable.
+    Genes are stored as parallel int32 arrays (struct-of-arrays). Indexing
+    returns ``Gene`` objects built on demand, and assigning a ``Gene`` (or a
+    slice of another chromosome) writes it back into the arrays.
+
+    Derived views such as ``to_timetable``, ``sorted_order`` and ``digest``
+    are cached against a version counter. Assignments through the chromosome bump it
+    automatically; code that writes to the arrays directly must call
+    ``mark_modified``.
 
     Attributes:
-        genes (List[Gene]): List of genes representing the timetable
+        group_ids (np.ndarray): Student group of each gene
+        day_idx (np.ndarray): Day of each gene, encoded through ``DAY_INDEX``
+        periods (np.ndarray): Period of each gene
+        timeslot_ids (np.ndarray): Timeslot of each gene
+        course_ids (np.ndarray): Course of each gene
+        teacher_ids (np.ndarray): Teacher of each gene
+        room_ids (np.ndarray): Room of each gene
     """
 
-    genes: List[Gene] = field(default_factory=list)
+    def __init__(self, genes: Iterable[Gene] = ()):
+        """
+        Builds a chromosome from a sequence of genes.
+
+        Args:
+            genes (Iterable[Gene], optional): Genes of the timetable.
+                Defaults to an empty chromosome.
+        """
+        self._version = 0
+        self._timetable_cache: Optional[Tuple[int, Timetable]] = None
+        self._group_timetable_cache: Optional[
+            Tuple[int, Dict[int, Dict[str, List[Gene]]]]
+        ] = None
+        self._digest_cache: Optional[Tuple[int, bytes]] = None
+        self._sorted_cache: Optional[Tuple[int, np.ndarray]] = None
+        columns = np.array(
+            [
+                (
+                    gene.group_id,
+                    DAY_INDEX[gene.day],
+                    gene.period,
+                    gene.timeslot_id,
+                    gene.course_id,
+                    gene.teacher_id,
+                    gene.room_id,
+                )
+                for gene in genes
+            ],
+            dtype=np.int32,
+        ).reshape(-1, len(GeneArrays._fields))
+        self._set_arrays(GeneArrays(*(np.ascontiguousarray(c) for c in columns.T)))
+
+    @classmethod
+    def from_arrays(cls, arrays: GeneArrays) -> "Chromosome":
+        """
+        Builds a chromosome that takes ownership of the given arrays.
+
+        Args:
+            arrays (GeneArrays): Gene attribute arrays of equal length
+
+        Returns:
+            Chromosome: Chromosome backed by the arrays
+        """
+        chromosome = cls()
+        chromosome._set_arrays(arrays)
+        return chromosome
+
+    def _set_arrays(self, arrays: GeneArrays) -> None:
+        for name, values in zip(GeneArrays._fields, arrays):
+            setattr(self, name, np.asarray(values, dtype=np.int32))
+        self.mark_modified()
+
+    def mark_modified(self) -> None:
+        """
+        Records that the genes changed, invalidating cached views.
+        """
+        self._version += 1
+
+    def as_arrays(self) -> GeneArrays:
+        """
+        Returns the gene storage arrays.
+
+        The arrays are not copied, so writes to them modify the chromosome;
+        call ``mark_modified`` after such writes.
+
+        Returns:
+            GeneArrays: Struct-of-arrays view of the genes
+        """
+        return GeneArrays(*(getattr(self, name) for name in GeneArrays._fields))
+
+    @property
+    def genes(self) -> List[Gene]:
+        """
+        Materializes the genes as a list of ``Gene`` objects.
+
+        The genes are snapshots; modifying them does not change the chromosome.
+        """
+        return list(self)
 
     def add_gene(self, gene: Gene) -> None:
         """
@@ -25,31 +139,157 @@ class Chromosome:
         Args:
             gene (Gene): Gene to be added to the chromosome
         """
-        self.genes.append(gene)
+        row = Chromosome([gene]).as_arrays()
+        self._set_arrays(
+            GeneArrays(*(np.concatenate(pair) for pair in zip(self.as_arrays(), row)))
+        )
+
+    def digest(self) -> bytes:
+        """
+        Hashes the genes, e.g. to memoize values that depend only on them.
 
-    def to_timetable(self) -> Dict[int, Dict[str, List[Gene]]]:
+        Chromosomes with equal genes have equal digests. The digest is
+        cached until the chromosome is modified.
+
+        Returns:
+            bytes: BLAKE2b digest of the gene arrays
+        """
+        cached = self._digest_cache
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        digest = hashlib.blake2b(digest_size=16)
+        for values in self.as_arrays():
+            digest.update(np.ascontiguousarray(values))
+        result = digest.digest()
+        self._digest_cache = (self._version, result)
+        return result
+
+    def sorted_order(self) -> np.ndarray:
+        """
+        Orders the genes by group, then day, then period.
+
+        The order is cached until the chromosome is modified and is shared
+        between callers, so it must not be modified.
+
+        Returns:
+            np.ndarray: Gene indices in timetable order
+        """
+        cached = self._sorted_cache
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        # One stable sort orders genes by group, then day, then period.
+        order = np.lexsort((self.periods, self.day_idx, self.group_ids))
+        self._sorted_cache = (self._version, order)
+        return order
+
+    def iter_sorted(
+        self, group_id: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, np.ndarray]]:
+        """
+        Iterates over the (group, day) runs of ``sorted_order``.
+
+        Args:
+            group_id (Optional[int], optional): Only iterate over the runs of
+                this group. Defaults to every group.
+
+        Yields:
+            Tuple[int, str, np.ndarray]: Group id, day name and the indices
+            of that group's genes on that day, ordered by period
+        """
+        order, starts, stops = self._sorted_runs(group_id)
+        for start, stop in zip(starts, stops):
+            run = order[start:stop]
+            first = run[0]
+            yield int(self.group_ids[first]), DAYS[self.day_idx[first]], run
+
+    def _sorted_runs(
+        self, group_id: Optional[int]
+    ) -> Tuple[np.ndarray, List[int], List[int]]:
+        order = self.sorted_order()
+        if group_id is not None:
+            order = order[self.group_ids[order] == group_id]
+        if order.size == 0:
+            return order, [], []
+        run_keys = (
+            self.group_ids[order].astype(np.int64) * len(DAYS) + self.day_idx[order]
+        )
+        bounds = np.flatnonzero(np.diff(run_keys)) + 1
+        return order, [0, *bounds.tolist()], [*bounds.tolist(), order.size]
+
+    def _timetable_runs(
+        self, group_id: Optional[int]
+    ) -> Iterator[Tuple[int, str, List[Gene]]]:
+        order, starts, stops = self._sorted_runs(group_id)
+        # The genes are built from whole sorted columns at once and then cut
+        # into runs, rather than indexing the arrays gene by gene.
+        genes = list(self._iter_genes(order))
+        for start, stop in zip(starts, stops):
+            first = genes[start]
+            yield first.group_id, first.day, genes[start:stop]
+
+    def to_timetable(
+        self, group_filter: Optional[int] = None
+    ) -> Dict[int, Dict[str, List[Gene]]]:
         """
         Organizes genes by group and day.
 
+        Groups appear in ascending id order, each group's days in
+        ``DAY_INDEX`` order, and each day's genes ordered by period; genes
+        sharing a period keep their chromosome order.
+
+        The full timetable, and each group's days when filtered, are cached
+        until the chromosome is modified and are shared between callers, so
+        they must not be modified. A filtered timetable is taken from the
+        full timetable when that is cached and otherwise built from that
+        group's genes alone.
+
+        Args:
+            group_filter (Optional[int], optional): Only include this group.
+                Defaults to every group.
+
         Returns:
             Dict[int, Dict[str, List[Gene]]]: Organized timetable
         """
-        timetable: Dict[int, Dict[str, List[Gene]]] = {}
-        for gene in self.genes:
-            timetable.setdefault(gene.group_id, {}).setdefault(gene.day, []).append(
-                gene
-            )
+        cached = self._timetable_cache
+        if cached is not None and cached[0] == self._version:
+            timetable = cached[1]
+            if group_filter is None:
+                return timetable
+            if group_filter in timetable:
+                return {group_filter: timetable[group_filter]}
+            return {}
 
-        for group in timetable:
-            for day in timetable[group]:
-                timetable[group][day].sort(key=lambda g: g.period)
+        if group_filter is not None:
+            return self._group_timetable(group_filter)
 
+        timetable = {}
+        for group_id, day, genes in self._timetable_runs(None):
+            timetable.setdefault(group_id, {})[day] = genes
+        self._timetable_cache = (self._version, timetable)
         return timetable
 
+    def _group_timetable(self, group_id: int) -> Timetable:
+        cached = self._group_timetable_cache
+        if cached is None or cached[0] != self._version:
+            cached = (self._version, {})
+            self._group_timetable_cache = cached
+
+        days = cached[1].get(group_id)
+        if days is None:
+            days = {day: genes for _, day, genes in self._timetable_runs(group_id)}
+            cached[1][group_id] = days
+        return {group_id: days} if days else {}
+
     def pretty_print(self) -> None:
         """
         Prints a formatted timetable using tabulate.
         """
+        # Imported here so that the GA, which only needs the arrays, does
+        # not load tabulate in every process.
+        from tabulate import tabulate
+
         timetable = self.to_timetable()
         for group_id, days in sorted(timetable.items()):
             print(f"\nTimetable for Group {group_id}:")
@@ -88,15 +328,82 @@ class Chromosome:
             output += "\n"
         return output
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(genes={self.genes!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Chromosome):
+            return NotImplemented
+        return all(
+            np.array_equal(mine, theirs)
+            for mine, theirs in zip(self.as_arrays(), other.as_arrays())
+        )
+
+    __hash__ = None
+
+    def _gene(self, index: int) -> Gene:
+        return Gene(
+            group_id=int(self.group_ids[index]),
+            day=DAYS[self.day_idx[index]],
+            period=int(self.periods[index]),
+            timeslot_id=int(self.timeslot_ids[index]),
+            course_id=int(self.course_ids[index]),
+            teacher_id=int(self.teacher_ids[index]),
+            room_id=int(self.room_ids[index]),
+        )
+
     # Sequence Interface Methods for DEAP compatibility
     def __len__(self):
-        return len(self.genes)
+        return len(self.group_ids)
 
     def __getitem__(self, index):
-        return self.genes[index]
+        if isinstance(index, slice):
+            # Copy, so that slice swaps such as DEAP's one-point crossover
+            # do not read data that has already been overwritten.
+            return type(self).from_arrays(
+                GeneArrays(*(values[index].copy() for values in self.as_arrays()))
+            )
+        return self._gene(index)
 
     def __setitem__(self, index, value):
-        self.genes[index] = value
+        if isinstance(index, slice):
+            if not isinstance(value, Chromosome):
+                value = Chromosome(value)
+            for target, source in zip(self.as_arrays(), value.as_arrays()):
+                target[index] = source
+            self.mark_modified()
+            return
+
+        self.group_ids[index] = value.group_id
+        self.day_idx[index] = DAY_INDEX[value.day]
+        self.periods[index] = value.period
+        self.timeslot_ids[index] = value.timeslot_id
+        self.course_ids[index] = value.course_id
+        self.teacher_ids[index] = value.teacher_id
+        self.room_ids[index] = value.room_id
+        self.mark_modified()
+
+    def __iter__(self) -> Iterator[Gene]:
+        return self._iter_genes(slice(None))
+
+    def _iter_genes(self, index) -> Iterator[Gene]:
+        for group_id, day, period, timeslot_id, course_id, teacher_id, room_id in zip(
+            *(values[index].tolist() for values in self.as_arrays())
+        ):
+            yield Gene(
+                group_id=group_id,
+                day=DAYS[day],
+                period=period,
+                timeslot_id=timeslot_id,
+                course_id=course_id,
+                teacher_id=teacher_id,
+                room_id=room_id,
+            )
+
 
-    def __iter__(self):
-        return iter(self.genes)
+# DEAP types for the genetic algorithm; the guard keeps repeated imports
+# (e.g. in worker processes) from registering them again.
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", Chromosome, fitness=creator.FitnessMin)
@@ -1,51 +1,161 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, NamedTuple
 
-from .chromosome import Chromosome
+import numpy as np
+from numba import njit
+
+from .chromosome import Chromosome, GeneArrays
 from models.teacher import Teacher
 from models.student_group import StudentGroup
+from models.timeslot import DAY_INDEX
+
+# ------------------------------
+# Lookup Tables
+# ------------------------------
+
+
+def build_teacher_pref_mask(teachers: List[Teacher], n_periods: int) -> np.ndarray:
+    """
+    Builds a boolean table of preferred teaching times.
+
+    ``mask[teacher_id, day_idx, period]`` is True when that slot is one of the
+    teacher's preferred times. Preferences with a period outside the period
+    axis are skipped; such slots count as not preferred.
+
+    Args:
+        teachers (List[Teacher]): Available teachers
+        n_periods (int): Size of the period axis (highest period + 1)
+
+    Returns:
+        np.ndarray: Mask of shape (max_teacher_id + 1, n_days, n_periods)
+    """
+    max_teacher_id = max((t.teacher_id for t in teachers), default=0)
+    mask = np.zeros((max_teacher_id + 1, len(DAY_INDEX), n_periods), dtype=bool)
+    for teacher in teachers:
+        for day, period in teacher.preferred_times:
+            if 0 <= period < n_periods:
+                mask[teacher.teacher_id, DAY_INDEX[day], period] = True
+    return mask
+
+
+def build_group_home_room(groups: List[StudentGroup]) -> np.ndarray:
+    """
+    Builds a table mapping each group id to its home room.
+
+    Groups without a home room map to -1.
+
+    Args:
+        groups (List[StudentGroup]): Student groups
+
+    Returns:
+        np.ndarray: Home room ids of shape (max_group_id + 1,)
+    """
+    max_group_id = max((g.group_id for g in groups), default=0)
+    home_room = np.full(max_group_id + 1, -1, dtype=np.int32)
+    for group in groups:
+        if group.home_room is not None:
+            home_room[group.group_id] = group.home_room
+    return home_room
+
+
+class FitnessTables(NamedTuple):
+    """
+    Id-indexed lookup tables needed to evaluate a chromosome.
+
+    Attributes:
+        teacher_pref_mask (np.ndarray): Table from ``build_teacher_pref_mask``
+        group_home_room (np.ndarray): Table from ``build_group_home_room``
+    """
+
+    teacher_pref_mask: np.ndarray
+    group_home_room: np.ndarray
+
+
+def build_fitness_tables(
+    teachers: List[Teacher], groups: List[StudentGroup], n_periods: int
+) -> FitnessTables:
+    """
+    Builds every lookup table used by ``evaluate_timetable``.
+
+    Args:
+        teachers (List[Teacher]): Available teachers
+        groups (List[StudentGroup]): Student groups
+        n_periods (int): Size of the period axis (highest period + 1)
+
+    Returns:
+        FitnessTables: Lookup tables for fitness evaluation
+    """
+    return FitnessTables(
+        teacher_pref_mask=build_teacher_pref_mask(teachers, n_periods),
+        group_home_room=build_group_home_room(groups),
+    )
+
 
 # ------------------------------
 # Hard Constraint Functions
 # ------------------------------
 
 
+def pack_slot_keys(
+    ids: np.ndarray, day_idx: np.ndarray, periods: np.ndarray
+) -> np.ndarray:
+    """
+    Packs (id, day, period) triples into single ``int64`` keys.
+
+    The day and period fields are sized from the largest day and period
+    present, so equal triples give equal keys and distinct triples distinct
+    keys for any period, and every id owns a contiguous block of keys.
+
+    Args:
+        ids (np.ndarray): Teacher, room or group id of each gene
+        day_idx (np.ndarray): Day of each gene, encoded through ``DAY_INDEX``
+        periods (np.ndarray): Period of each gene
+
+    Returns:
+        np.ndarray: Packed keys
+
+    Raises:
+        ValueError: If the keys would not fit into ``int64``
+    """
+    if periods.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    n_days = int(day_idx.max()) + 1
+    n_periods = int(periods.max()) + 1
+    if (int(ids.max()) + 1) * n_days * n_periods > np.iinfo(np.int64).max:
+        raise ValueError("Ids, days and periods are too large to fit a slot key")
+    return (ids.astype(np.int64) * n_days + day_idx) * n_periods + periods
+
+
+def _slot_conflict_penalty(
+    ids: np.ndarray, day_idx: np.ndarray, periods: np.ndarray
+) -> float:
+    """
+    Counts how often the same id occupies a (day, period) slot more than once.
+
+    All occurrences of each packed slot key are counted with a single
+    ``np.unique``, so no buffer scales with the range of the keys.
+    """
+    if ids.size == 0:
+        return 0
+    _, counts = np.unique(pack_slot_keys(ids, day_idx, periods), return_counts=True)
+    return 1000 * int((counts[counts > 1] - 1).sum())
+
+
 def penalty_teacher_conflict(individual: Chromosome) -> float:
     """Penalty for a teacher assigned to more than one class at the same day and period."""
-    penalty = 0
-    teacher_conflicts: Dict[Tuple[int, str, int], int] = {}
-    for gene in individual.genes:
-        key = (gene.teacher_id, gene.day, gene.period)
-        teacher_conflicts[key] = teacher_conflicts.get(key, 0) + 1
-    for count in teacher_conflicts.values():
-        if count > 1:
-            penalty += 1000 * (count - 1)
-    return penalty
+    arrays = individual.as_arrays()
+    return _slot_conflict_penalty(arrays.teacher_ids, arrays.day_idx, arrays.periods)
 
 
 def penalty_room_conflict(individual: Chromosome) -> float:
     """Penalty for a room being assigned to more than one class at the same day and period."""
-    penalty = 0
-    room_conflicts: Dict[Tuple[int, str, int], int] = {}
-    for gene in individual.genes:
-        key = (gene.room_id, gene.day, gene.period)
-        room_conflicts[key] = room_conflicts.get(key, 0) + 1
-    for count in room_conflicts.values():
-        if count > 1:
-            penalty += 1000 * (count - 1)
-    return penalty
+    arrays = individual.as_arrays()
+    return _slot_conflict_penalty(arrays.room_ids, arrays.day_idx, arrays.periods)
 
 
 def penalty_group_conflict(individual: Chromosome) -> float:
     """Penalty for a student group having more than one lesson at the same day and period."""
-    penalty = 0
-    group_conflicts: Dict[Tuple[int, str, int], int] = {}
-    for gene in individual.genes:
-        key = (gene.group_id, gene.day, gene.period)
-        group_conflicts[key] = group_conflicts.get(key, 0) + 1
-    for count in group_conflicts.values():
-        if count > 1:
-            penalty += 1000 * (count - 1)
-    return penalty
+    arrays = individual.as_arrays()
+    return _slot_conflict_penalty(arrays.group_ids, arrays.day_idx, arrays.periods)
 
 
 # ------------------------------
@@ -54,20 +164,23 @@ def penalty_group_conflict(individual: Chromosome) -> float:
 
 
 def penalty_teacher_time_preference(
-    individual: Chromosome, teachers: List[Teacher]
+    individual: Chromosome, teacher_pref_mask: np.ndarray
 ) -> float:
     """
     Penalizes a gene if the assigned teacher is scheduled outside his/her preferred times.
     Each violation adds 1 penalty point.
+
+    ``teacher_pref_mask`` is the table built by ``build_teacher_pref_mask``.
     """
-    penalty = 0
-    for gene in individual.genes:
-        teacher_pref = next(
-            (t.preferred_times for t in teachers if t.teacher_id == gene.teacher_id), []
-        )
-        if (gene.day, gene.period) not in teacher_pref:
-            penalty += 1
-    return penalty
+    arrays = individual.as_arrays()
+    # Periods beyond the mask's period axis are never preferred.
+    in_range = arrays.periods < teacher_pref_mask.shape[2]
+    preferred = teacher_pref_mask[
+        arrays.teacher_ids[in_range],
+        arrays.day_idx[in_range],
+        arrays.periods[in_range],
+    ]
+    return int((~preferred).sum()) + int((~in_range).sum())
 
 
 def penalty_teacher_workload_balance(individual: Chromosome) -> float:
@@ -76,34 +189,26 @@ def penalty_teacher_workload_balance(individual: Chromosome) -> float:
     The penalty is the sum of the absolute differences between each teacher's load
     and the average load.
     """
-    penalty = 0
-    teacher_assignments: Dict[int, int] = {}
-    for gene in individual.genes:
-        teacher_assignments.setdefault(gene.teacher_id, 0)
-        teacher_assignments[gene.teacher_id] += 1
-
-    if teacher_assignments:
-        avg_load = sum(teacher_assignments.values()) / len(teacher_assignments)
-        for load in teacher_assignments.values():
-            penalty += abs(load - avg_load)
-    return penalty
+    teacher_ids = individual.as_arrays().teacher_ids
+    if teacher_ids.size == 0:
+        return 0
+    counts = np.bincount(teacher_ids)
+    loads = counts[counts > 0]
+    return float(np.abs(loads - loads.mean()).sum())
 
 
 def penalty_group_home_room(
-    individual: Chromosome, groups: List[StudentGroup]
+    individual: Chromosome, group_home_room: np.ndarray
 ) -> float:
     """
     Penalizes the timetable if a group is scheduled in a room other than its designated home room.
     Each violation adds 1 penalty point.
+
+    ``group_home_room`` is the table built by ``build_group_home_room``.
     """
-    penalty = 0
-    for gene in individual.genes:
-        group_home = next(
-            (g.home_room for g in groups if g.group_id == gene.group_id), None
-        )
-        if group_home is not None and gene.room_id != group_home:
-            penalty += 1
-    return penalty
+    arrays = individual.as_arrays()
+    home = group_home_room[arrays.group_ids]
+    return int(((home >= 0) & (home != arrays.room_ids)).sum())
 
 
 # ------------------------------
@@ -195,14 +300,202 @@ def penalty_teacher_multiple_first_periods(individual: Chromosome) -> float:
     return penalty
 
 
+# ------------------------------
+# Fused Evaluation
+# ------------------------------
+
+
+@njit(cache=True, fastmath=False, inline="always")
+def _add_key(keys, key):
+    """
+    Adds a non-negative key to an open-addressing hash set.
+
+    ``keys`` has a power-of-two size, is filled with -1 when empty and must
+    never become full.
+
+    Returns:
+        bool: Whether the key was not in the set yet
+    """
+    mask = keys.shape[0] - 1
+    h = key ^ (key >> 17)
+    h *= 0x2545F4914F6CDD1D
+    slot = (h ^ (h >> 29)) & mask
+    while keys[slot] >= 0:
+        if keys[slot] == key:
+            return False
+        slot = (slot + 1) & mask
+    keys[slot] = key
+    return True
+
+
+@njit(cache=True, fastmath=False)
+def _evaluate_core(
+    group_ids,
+    day_idx,
+    periods,
+    course_ids,
+    teacher_ids,
+    room_ids,
+    teacher_pref_mask,
+    group_home_room,
+    n_days,
+    hard_w,
+):
+    """
+    Native kernel behind ``evaluate_vectorized``.
+
+    Makes a single loop over the genes, counting occupancy in dense buffers
+    indexed by packed (id, day, period) keys. A repeated key is a clash; a
+    key seen for the first time is checked against the neighbouring periods
+    of the same teacher and day to count consecutive lessons.
+
+    The (teacher, course) and (teacher, course, group) combinations seen so
+    far are kept in hash sets sized by the number of genes, since dense
+    buffers over those id ranges would grow with the dataset instead.
+    """
+    n_genes = group_ids.shape[0]
+    if n_genes == 0:
+        return 0.0
+
+    n_periods = periods.max() + 1
+    n_teachers = teacher_ids.max() + 1
+    n_groups = group_ids.max() + 1
+    n_courses = course_ids.max() + 1
+    n_slots = n_days * n_periods
+    preferred_periods = teacher_pref_mask.shape[2]
+
+    teacher_slots = np.zeros(n_teachers * n_slots, np.int32)
+    room_slots = np.zeros((room_ids.max() + 1) * n_slots, np.int32)
+    group_slots = np.zeros(n_groups * n_slots, np.int32)
+    teacher_load = np.zeros(n_teachers, np.int32)
+    first_periods = np.zeros(n_teachers, np.int32)
+    # Large enough to stay at most half full.
+    n_keys = 1
+    while n_keys < 2 * n_genes:
+        n_keys *= 2
+    teacher_course = np.full(n_keys, -1, np.int64)
+    teacher_course_group = np.full(n_keys, -1, np.int64)
+    day_first = np.full(n_groups * n_days, n_periods, np.int32)
+    day_last = np.full(n_groups * n_days, -1, np.int32)
+
+    slot_conflicts = 0
+    extra_conflicts = 0
+    not_preferred = 0
+    away_from_home = 0
+    consecutive_lessons = 0
+
+    for i in range(n_genes):
+        g = group_ids[i]
+        d = day_idx[i]
+        p = periods[i]
+        c = course_ids[i]
+        t = teacher_ids[i]
+        r = room_ids[i]
+        slot = d * n_periods + p
+
+        key = t * n_slots + slot
+        if teacher_slots[key] > 0:
+            slot_conflicts += 1
+        else:
+            if p > 0 and teacher_slots[key - 1] > 0:
+                consecutive_lessons += 1
+            if p + 1 < n_periods and teacher_slots[key + 1] > 0:
+                consecutive_lessons += 1
+        teacher_slots[key] += 1
+
+        key = r * n_slots + slot
+        if room_slots[key] > 0:
+            slot_conflicts += 1
+        room_slots[key] += 1
+
+        key = g * n_slots + slot
+        if group_slots[key] > 0:
+            slot_conflicts += 1
+        group_slots[key] += 1
+
+        key = g * n_days + d
+        day_first[key] = min(day_first[key], p)
+        day_last[key] = max(day_last[key], p)
+
+        teacher_load[t] += 1
+        if not (p < preferred_periods and teacher_pref_mask[t, d, p]):
+            not_preferred += 1
+        home = group_home_room[g]
+        if home >= 0 and home != r:
+            away_from_home += 1
+
+        key = np.int64(t) * n_courses + c
+        if _add_key(teacher_course_group, key * n_groups + g):
+            if not _add_key(teacher_course, key):
+                extra_conflicts += 1
+
+        if p == 1:
+            if first_periods[t] > 0:
+                extra_conflicts += 1
+            first_periods[t] += 1
+
+    total_load = 0
+    busy_teachers = 0
+    for t in range(n_teachers):
+        if teacher_load[t] > 0:
+            total_load += teacher_load[t]
+            busy_teachers += 1
+    avg_load = total_load / busy_teachers
+    workload_imbalance = 0.0
+    for t in range(n_teachers):
+        if teacher_load[t] > 0:
+            workload_imbalance += abs(teacher_load[t] - avg_load)
+
+    scheduled_span = 0
+    for key in range(n_groups * n_days):
+        if day_last[key] >= 0:
+            scheduled_span += day_last[key] - day_first[key] + 1
+    schedule_gaps = scheduled_span - n_genes
+
+    total_penalty = hard_w * slot_conflicts
+    total_penalty += not_preferred
+    total_penalty += workload_imbalance
+    total_penalty += away_from_home
+    total_penalty += 0.5 * consecutive_lessons
+    total_penalty += 0.5 * schedule_gaps
+    total_penalty += hard_w * extra_conflicts
+    return total_penalty
+
+
+def evaluate_vectorized(arrays: GeneArrays, tables: FitnessTables) -> float:
+    """
+    Computes the total penalty of all constraints in one pass over the gene arrays.
+
+    The work is done by the Numba-compiled ``_evaluate_core``, which only
+    sees plain integer arrays.
+
+    Args:
+        arrays (GeneArrays): Gene arrays of the chromosome
+        tables (FitnessTables): Lookup tables from ``build_fitness_tables``
+
+    Returns:
+        float: Total penalty value (lower is better)
+    """
+    return _evaluate_core(
+        arrays.group_ids,
+        arrays.day_idx,
+        arrays.periods,
+        arrays.course_ids,
+        arrays.teacher_ids,
+        arrays.room_ids,
+        tables.teacher_pref_mask,
+        tables.group_home_room,
+        len(DAY_INDEX),
+        1000,
+    )
+
+
 # ------------------------------
 # Main Evaluation Function
 # ------------------------------
 
 
-def evaluate_timetable(
-    individual: Chromosome, teachers: List[Teacher], groups: List[StudentGroup]
-) -> Tuple[float]:
+def evaluate_timetable(individual: Chromosome, tables: FitnessTables) -> Tuple[float]:
     """
     Evaluates the fitness of a timetable chromosome by applying various constraints.
 
@@ -224,29 +517,15 @@ def evaluate_timetable(
       - A teacher should not teach the same subject for different groups.
       - A teacher should not have more than one class in the first period.
 
-    Lower penalty indicates a better solution.
+    Lower penalty indicates a better solution. The constraints are computed
+    together by ``evaluate_vectorized``; the individual ``penalty_*``
+    functions remain available for per-constraint reporting.
+
+    Args:
+        individual (Chromosome): Chromosome to evaluate
+        tables (FitnessTables): Lookup tables from ``build_fitness_tables``
 
     Returns:
         Tuple[float]: Total penalty value (lower is better)
     """
-    total_penalty = 0
-
-    # Hard constraints
-    total_penalty += penalty_teacher_conflict(individual)
-    total_penalty += penalty_room_conflict(individual)
-    total_penalty += penalty_group_conflict(individual)
-
-    # Soft constraints
-    total_penalty += penalty_teacher_time_preference(individual, teachers)
-    total_penalty += penalty_teacher_workload_balance(individual)
-    total_penalty += penalty_group_home_room(individual, groups)
-
-    # Additional soft constraints
-    total_penalty += penalty_subject_distribution(individual)
-    total_penalty += penalty_group_schedule_gap(individual, groups)
-
-    # Additional hard constraints
-    total_penalty += penalty_teacher_same_subject_across_groups(individual)
-    total_penalty += penalty_teacher_multiple_first_periods(individual)
-
-    return (total_penalty,)
+    return (evaluate_vectorized(individual.as_arrays(), tables),)
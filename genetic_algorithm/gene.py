@@ -1,8 +1,7 @@
 from dataclasses import dataclass
-from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Gene:
     """
     Represents a single gene in the timetable scheduling chromosome.
@@ -10,6 +9,10 @@ class Gene:
     A gene encapsulates the assignment of a course to a specific group,
     at a particular time, with a specific teacher and room.
 
+    Genes are built in bulk from chromosome arrays, so they are not
+    validated individually; days and periods are validated once, when
+    the ``TimeSlot`` objects they come from are created.
+
     Attributes:
         group_id (int): Identifier of the student group
         day (str): Day of the week for the class
@@ -18,7 +21,6 @@ class Gene:
         course_id (int): Identifier of the course
         teacher_id (int): Identifier of the assigned teacher
         room_id (int): Identifier of the assigned room
-        is_fixed (bool, optional): Indicates if the gene should not be altered. Defaults to False.
     """
 
     group_id: int
@@ -28,18 +30,3 @@ class Gene:
     course_id: int
     teacher_id: int
     room_id: int
-    is_fixed: Optional[bool] = False
-
-    def __post_init__(self):
-        """
-        Validates the gene's attributes during initialization.
-
-        Raises:
-            ValueError: If period is not positive or day is invalid.
-        """
-        if self.period < 1:
-            raise ValueError("Period must be a positive integer")
-
-        valid_days = {"Monday", "Tuesday", "Wednesday", "Thursday", "Friday"}
-        if self.day not in valid_days:
-            raise ValueError(f"Invalid day: {self.day}. Expected one of {valid_days}")
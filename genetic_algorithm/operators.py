@@ -1,72 +1,135 @@
-import random
 from typing import List, Tuple
 
+import numpy as np
+
 from .chromosome import Chromosome
-from models.teacher import Teacher
-from models.room import Room
-from models.course import Course
-from models.timeslot import TimeSlot
+from models.timeslot import TimeSlot, DAY_INDEX
 
 
-def crossover(ind1: Chromosome, ind2: Chromosome) -> Tuple[Chromosome, Chromosome]:
+def crossover(
+    ind1: Chromosome, ind2: Chromosome, rng: np.random.Generator
+) -> Tuple[Chromosome, Chromosome]:
     """
     Perform single-point crossover on two chromosomes.
 
     Args:
         ind1 (Chromosome): First parent chromosome
         ind2 (Chromosome): Second parent chromosome
+        rng (np.random.Generator): Random number generator
 
     Returns:
         Tuple[Chromosome, Chromosome]: Offspring chromosomes after crossover
     """
-    size = len(ind1.genes)
+    size = len(ind1)
     if size < 2:
         return ind1, ind2
 
-    cxpoint = random.randint(1, size - 1)
-    ind1.genes[cxpoint:], ind2.genes[cxpoint:] = (
-        ind2.genes[cxpoint:],
-        ind1.genes[cxpoint:],
-    )
+    cxpoint = int(rng.integers(1, size))
+    # Swap the tails of every gene array in place; only the tail is copied.
+    for genes1, genes2 in zip(ind1.as_arrays(), ind2.as_arrays()):
+        tail = genes1[cxpoint:].copy()
+        genes1[cxpoint:] = genes2[cxpoint:]
+        genes2[cxpoint:] = tail
+    ind1.mark_modified()
+    ind2.mark_modified()
     return ind1, ind2
 
 
+def build_timeslot_lookup(timeslots: List[TimeSlot]) -> np.ndarray:
+    """
+    Builds a table mapping (day index, period) to the timeslot id.
+
+    Args:
+        timeslots (List[TimeSlot]): Available timeslots
+
+    Returns:
+        np.ndarray: Slot ids of shape (n_days, max_period + 1); -1 where no
+        timeslot exists
+    """
+    max_period = max((ts.period for ts in timeslots), default=0)
+    lookup = np.full((len(DAY_INDEX), max_period + 1), -1, dtype=np.int32)
+    for ts in timeslots:
+        lookup[ts.day_idx, ts.period] = ts.slot_id
+    return lookup
+
+
+def build_allowed_slots(
+    allowed_times: List[Tuple[str, int]], timeslot_lookup: np.ndarray
+) -> np.ndarray:
+    """
+    Builds the table of (day index, period) cells a mutated gene may move to.
+
+    Allowed times without a matching timeslot are left out.
+
+    Args:
+        allowed_times (List[Tuple[str, int]]): Allowed (day, period) pairs,
+            e.g. ``SchedulingConfig.ALLOWED_TEACHING_TIMES``
+        timeslot_lookup (np.ndarray): Table from ``build_timeslot_lookup``
+
+    Returns:
+        np.ndarray: Allowed cells of shape (n_allowed, 2)
+
+    Raises:
+        ValueError: If no allowed time has a timeslot
+    """
+    n_days, n_periods = timeslot_lookup.shape
+    allowed = np.zeros((n_days, n_periods), dtype=bool)
+    for day, period in allowed_times:
+        if 0 <= period < n_periods:
+            allowed[DAY_INDEX[day], period] = True
+    allowed &= timeslot_lookup >= 0
+
+    # Row-major order of the mask keeps the cells sorted by day, then period.
+    slots = np.argwhere(allowed).astype(np.int32)
+    if len(slots) == 0:
+        raise ValueError("None of the allowed teaching times has a timeslot")
+    return slots
+
+
 def mutation(
     individual: Chromosome,
-    teachers: List[Teacher],
-    rooms: List[Room],
-    courses: List[Course],
-    timeslots: List[TimeSlot],
+    rng: np.random.Generator,
+    teacher_ids: np.ndarray,
+    room_ids: np.ndarray,
+    course_ids: np.ndarray,
+    allowed_slots: np.ndarray,
+    timeslot_lookup: np.ndarray,
     indpb: float = 0.1,
 ) -> Tuple[Chromosome]:
     """
     Perform mutation on a chromosome with given probability.
 
+    Each attribute is mutated independently: one random mask selects the
+    genes to change, and all replacement values are drawn in a single call.
+
     Args:
         individual (Chromosome): Chromosome to mutate
-        teachers (List[Teacher]): Available teachers
-        rooms (List[Room]): Available rooms
-        courses (List[Course]): Available courses
-        timeslots (List[TimeSlot]): Available timeslots
+        rng (np.random.Generator): Random number generator
+        teacher_ids (np.ndarray): Ids of the available teachers
+        room_ids (np.ndarray): Ids of the available rooms
+        course_ids (np.ndarray): Ids of the available courses
+        allowed_slots (np.ndarray): Table from ``build_allowed_slots``
+        timeslot_lookup (np.ndarray): Table from ``build_timeslot_lookup``
         indpb (float, optional): Mutation probability. Defaults to 0.1.
 
     Returns:
         Tuple[Chromosome]: Mutated chromosome
     """
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    periods = [1, 2, 3]
-    timeslot_map = {(ts.day, ts.period): ts.slot_id for ts in timeslots}
-
-    for gene in individual.genes:
-        if random.random() < indpb:
-            gene.teacher_id = random.choice(teachers).teacher_id
-        if random.random() < indpb:
-            gene.course_id = random.choice(courses).course_id
-        if random.random() < indpb:
-            gene.room_id = random.choice(rooms).room_id
-        if random.random() < indpb:
-            gene.day = random.choice(days)
-            gene.period = random.choice(periods)
-            gene.timeslot_id = timeslot_map[(gene.day, gene.period)]
+    n_genes = len(individual)
+
+    for values, choices in (
+        (individual.teacher_ids, teacher_ids),
+        (individual.course_ids, course_ids),
+        (individual.room_ids, room_ids),
+    ):
+        mask = rng.random(n_genes) < indpb
+        values[mask] = rng.choice(choices, size=np.count_nonzero(mask))
+
+    mask = rng.random(n_genes) < indpb
+    slots = allowed_slots[rng.integers(len(allowed_slots), size=np.count_nonzero(mask))]
+    individual.day_idx[mask] = slots[:, 0]
+    individual.periods[mask] = slots[:, 1]
+    individual.timeslot_ids[mask] = timeslot_lookup[slots[:, 0], slots[:, 1]]
 
+    individual.mark_modified()
     return (individual,)
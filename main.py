@@ -1,18 +1,62 @@
-import random
+import itertools
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from deap import base, creator, tools
 
-from genetic_algorithm.chromosome import Chromosome
-from genetic_algorithm.operators import crossover, mutation
-from genetic_algorithm.fitness import evaluate_timetable
+from genetic_algorithm.chromosome import DAYS, Chromosome, GeneArrays
+from genetic_algorithm.operators import (
+    build_allowed_slots,
+    build_timeslot_lookup,
+    crossover,
+    mutation,
+)
+from genetic_algorithm.fitness import (
+    FitnessTables,
+    build_fitness_tables,
+    evaluate_timetable,
+    evaluate_vectorized,
+)
 
 from utils.data_generator import DataGenerator
-from utils.repair_operator import RepairOperator
+from utils.repair_operator import RepairOperator, build_repair_tables
 from utils.visualization import TimetableVisualizer
 
+from models.timeslot import DAY_INDEX
+
 from config.settings import SchedulingConfig
 
 
+@dataclass
+class _EvaluationContext:
+    """
+    Read-only data a fitness worker needs, shipped once per worker process.
+    """
+
+    tables: FitnessTables
+
+
+_worker_context: Optional[_EvaluationContext] = None
+
+
+def _init_evaluation_worker(context: _EvaluationContext) -> None:
+    """
+    Process pool initializer: stores the evaluation context in the worker.
+    """
+    global _worker_context
+    _worker_context = context
+
+
+def _evaluate_worker(arrays: GeneArrays) -> Tuple[float]:
+    """
+    Evaluates one chromosome, given as its gene arrays, inside a worker process.
+    """
+    return (evaluate_vectorized(arrays, _worker_context.tables),)
+
+
 class TimetableScheduler:
     """
     Main application class for timetable scheduling using genetic algorithm.
@@ -31,18 +75,43 @@ class TimetableScheduler:
         """
         self.config = config
 
-        # Set random seed for reproducibility
-        random.seed(config.RANDOM_SEED)
-
-        # DEAP setup
-        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-        creator.create("Individual", Chromosome, fitness=creator.FitnessMin)
+        # Set random seed for reproducibility. Independent child streams are
+        # spawned from one seed sequence; the GA generator drives
+        # initialization, selection, crossover, mutation and repair.
+        self.seed_sequence = np.random.SeedSequence(config.RANDOM_SEED)
+        (ga_seed,) = self.seed_sequence.spawn(1)
+        self.rng = np.random.default_rng(ga_seed)
 
+        # DEAP setup; the Individual type is registered by
+        # genetic_algorithm.chromosome
         self.toolbox = base.Toolbox()
 
         # Prepare dataset
         self._prepare_dataset()
 
+        # Worker processes for fitness evaluation, only when configured: a
+        # compiled evaluation is cheaper than sending the chromosome to a
+        # worker. The lookup tables are sent once per worker rather than
+        # with every chromosome.
+        self.pool: Optional[ProcessPoolExecutor] = None
+        if config.EVALUATION_WORKERS is not None and config.EVALUATION_WORKERS > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=config.EVALUATION_WORKERS,
+                initializer=_init_evaluation_worker,
+                initargs=(_EvaluationContext(tables=self.fitness_tables),),
+            )
+
+        # Fitness values by chromosome digest, least recently used first
+        self._fitness_cache: OrderedDict[bytes, Tuple[float]] = OrderedDict()
+        self._fitness_cache_size = (
+            4 * config.POPULATION_SIZE
+            if config.FITNESS_CACHE_SIZE is None
+            else config.FITNESS_CACHE_SIZE
+        )
+
+        # Penalties of the current population, indexed like it
+        self.fitness_arr = np.full(config.POPULATION_SIZE, np.inf)
+
         # Setup genetic algorithm components
         self._setup_genetic_algorithm()
 
@@ -54,10 +123,70 @@ class TimetableScheduler:
             DataGenerator.create_complete_dataset_dc()
         )
 
+        # Lookup tables indexed by id, so fitness evaluation and repair never
+        # have to search the teacher, room or group lists. Their period axis
+        # covers every period a gene or a teacher preference can refer to.
+        n_periods = 1 + max(
+            itertools.chain(
+                self.config.PERIODS_PER_DAY,
+                (timeslot.period for timeslot in self.timeslots),
+                (period for t in self.teachers for _, period in t.preferred_times),
+            )
+        )
+        self.fitness_tables = build_fitness_tables(
+            self.teachers, self.groups, n_periods
+        )
+        self.repair_tables = build_repair_tables(
+            self.teachers, self.rooms, self.courses, n_periods
+        )
+
     def _setup_genetic_algorithm(self):
         """
         Configure DEAP toolbox for genetic algorithm operations.
         """
+        # Id arrays and timeslot lookup shared by initialization and mutation
+        self._teacher_id_array = np.array(
+            [t.teacher_id for t in self.teachers], dtype=np.int32
+        )
+        self._room_id_array = np.array([r.room_id for r in self.rooms], dtype=np.int32)
+        self._course_id_array = np.array(
+            [c.course_id for c in self.courses], dtype=np.int32
+        )
+        self._timeslot_lookup = build_timeslot_lookup(self.timeslots)
+        self._allowed_slots = build_allowed_slots(
+            self.config.ALLOWED_TEACHING_TIMES, self._timeslot_lookup
+        )
+
+        # Every group-day-period cell gets one gene; the cells are the same
+        # for all individuals, so they are laid out once.
+        cells = np.array(
+            list(
+                itertools.product(
+                    [g.group_id for g in self.groups],
+                    [DAY_INDEX[day] for day in self.config.DAYS_OF_WEEK],
+                    self.config.PERIODS_PER_DAY,
+                )
+            ),
+            dtype=np.int32,
+        ).reshape(-1, 3)
+        cell_groups, cell_days, cell_periods = (
+            np.ascontiguousarray(column) for column in cells.T
+        )
+        cell_timeslots = np.full(len(cell_periods), -1, dtype=np.int32)
+        in_lookup = cell_periods < self._timeslot_lookup.shape[1]
+        cell_timeslots[in_lookup] = self._timeslot_lookup[
+            cell_days[in_lookup], cell_periods[in_lookup]
+        ]
+        # A configured cell without a timeslot cannot be scheduled at all.
+        missing = cell_timeslots < 0
+        if missing.any():
+            cells_missing = sorted(
+                set(zip(cell_days[missing].tolist(), cell_periods[missing].tolist()))
+            )
+            raise ValueError(
+                "No timeslot for configured day and period: "
+                + ", ".join(f"({DAYS[d]}, {p})" for d, p in cells_missing)
+            )
 
         def init_individual():
             """
@@ -66,67 +195,100 @@ class TimetableScheduler:
             Returns:
                 Individual chromosome for genetic algorithm
             """
-            chromosome = Chromosome()
-            for group in self.groups:
-                for day in self.config.DAYS_OF_WEEK:
-                    for period in self.config.PERIODS_PER_DAY:
-                        # Generate a random gene for each group-day-period combination
-                        gene = self._generate_random_gene(group.group_id, day, period)
-                        chromosome.add_gene(gene)
-            return creator.Individual(chromosome.genes)
-
-        self.toolbox.register(
-            "individual", tools.initIterate, creator.Individual, init_individual
-        )
+            n_cells = len(cell_groups)
+            return creator.Individual.from_arrays(
+                GeneArrays(
+                    group_ids=cell_groups.copy(),
+                    day_idx=cell_days.copy(),
+                    periods=cell_periods.copy(),
+                    timeslot_ids=cell_timeslots.copy(),
+                    course_ids=self.rng.choice(self._course_id_array, n_cells),
+                    teacher_ids=self.rng.choice(self._teacher_id_array, n_cells),
+                    room_ids=self.rng.choice(self._room_id_array, n_cells),
+                )
+            )
+
+        self.toolbox.register("individual", init_individual)
         self.toolbox.register(
             "population", tools.initRepeat, list, self.toolbox.individual
         )
 
-        # Genetic operators
+        # Genetic operators; "evaluate" is what _evaluate_population runs
+        # in this process, while worker processes call _evaluate_worker
         self.toolbox.register(
-            "evaluate", lambda ind: evaluate_timetable(ind, self.teachers, self.groups)
+            "evaluate", lambda ind: evaluate_timetable(ind, self.fitness_tables)
         )
-        self.toolbox.register("mate", crossover)
+        self.toolbox.register("mate", crossover, rng=self.rng)
         self.toolbox.register(
             "mutate",
             lambda ind: mutation(
                 ind,
-                self.teachers,
-                self.rooms,
-                self.courses,
-                self.timeslots,
+                self.rng,
+                self._teacher_id_array,
+                self._room_id_array,
+                self._course_id_array,
+                self._allowed_slots,
+                self._timeslot_lookup,
                 indpb=self.config.MUTATION_INDIVIDUAL_PROBABILITY,
             ),
         )
-        self.toolbox.register("select", tools.selTournament, tournsize=3)
 
-    def _generate_random_gene(self, group_id: int, day: str, period: int):
+    def _evaluate_population(self, individuals: List[Chromosome]) -> None:
         """
-        Generate a random gene for a specific group, day, and period.
+        Evaluate individuals and store their fitness values.
 
-        Args:
-            group_id (int): Identifier of the student group
-            day (str): Day of the week
-            period (int): Period number
+        Individuals are evaluated in the worker pool when one is configured
+        and in this process otherwise. Fitness values are memoized by
+        chromosome digest, so individuals whose genes were already evaluated
+        recently, or that are duplicated within the batch, are not evaluated
+        again.
 
-        Returns:
-            Gene with randomized attributes
+        Args:
+            individuals (List[Chromosome]): Individuals to evaluate
         """
-        from genetic_algorithm.gene import Gene
+        pending: Dict[bytes, List[Chromosome]] = {}
+        for ind in individuals:
+            key = ind.digest()
+            fitness = self._fitness_cache.get(key)
+            if fitness is not None:
+                self._fitness_cache.move_to_end(key)
+                ind.fitness.values = fitness
+            else:
+                pending.setdefault(key, []).append(ind)
+
+        batch = [same[0] for same in pending.values()]
+        if self.pool is None:
+            fitnesses = [self.toolbox.evaluate(ind) for ind in batch]
+        else:
+            fitnesses = self.pool.map(
+                _evaluate_worker, [ind.as_arrays() for ind in batch], chunksize=8
+            )
+        for (key, same), fitness in zip(pending.items(), fitnesses):
+            for ind in same:
+                ind.fitness.values = fitness
+            if self._fitness_cache_size > 0:
+                self._fitness_cache[key] = fitness
+
+        while len(self._fitness_cache) > self._fitness_cache_size:
+            self._fitness_cache.popitem(last=False)
+
+    def _fast_tournament(self, k: int, tournsize: int) -> np.ndarray:
+        """
+        Tournament selection over ``self.fitness_arr``.
 
-        timeslot_id = next(
-            ts.slot_id for ts in self.timeslots if ts.day == day and ts.period == period
-        )
+        Draws ``k`` tournaments of ``tournsize`` random aspirants each and
+        keeps the one with the lowest penalty from every tournament.
 
-        return Gene(
-            group_id=group_id,
-            day=day,
-            period=period,
-            timeslot_id=timeslot_id,
-            course_id=random.choice(self.courses).course_id,
-            teacher_id=random.choice(self.teachers).teacher_id,
-            room_id=random.choice(self.rooms).room_id,
-        )
+        Args:
+            k (int): Number of individuals to select
+            tournsize (int): Number of aspirants per tournament
+
+        Returns:
+            np.ndarray: Population indices of the selected individuals
+        """
+        aspirants = self.rng.integers(len(self.fitness_arr), size=(k, tournsize))
+        winners = np.argmin(self.fitness_arr[aspirants], axis=1)
+        return aspirants[np.arange(k), winners]
 
     def run(self):
         """
@@ -139,9 +301,13 @@ class TimetableScheduler:
 
         # Initial repair and evaluation
         for ind in pop:
-            chromosome = Chromosome(genes=ind)
-            RepairOperator.repair_timetable(chromosome, self.teachers, self.rooms)
-            ind.fitness.values = self.toolbox.evaluate(ind)
+            RepairOperator.repair_timetable(ind, self.repair_tables, self.rng)
+        self._evaluate_population(pop)
+
+        self.fitness_arr = np.array([ind.fitness.values[0] for ind in pop])
+
+        # Best penalties of the most recent generations, for early stopping
+        best_history = deque(maxlen=self.config.EARLY_STOP_PATIENCE)
 
         # Evolutionary loop
         for gen in range(self.config.MAX_GENERATIONS):
@@ -149,39 +315,61 @@ class TimetableScheduler:
                 print(f"\n--- Generation {gen} ---")
 
             # Select offspring
-            offspring = self.toolbox.select(pop, len(pop))
-            offspring = list(map(self.toolbox.clone, offspring))
+            chosen = self._fast_tournament(len(pop), tournsize=3)
+            offspring = [self.toolbox.clone(pop[i]) for i in chosen]
+            offspring_fitness = self.fitness_arr[chosen]
 
             # Crossover
             for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < self.config.CROSSOVER_PROBABILITY:
+                if self.rng.random() < self.config.CROSSOVER_PROBABILITY:
                     self.toolbox.mate(child1, child2)
                     del child1.fitness.values
                     del child2.fitness.values
 
             # Mutation
             for mutant in offspring:
-                if random.random() < self.config.MUTATION_PROBABILITY:
+                if self.rng.random() < self.config.MUTATION_PROBABILITY:
                     self.toolbox.mutate(mutant)
                     del mutant.fitness.values
 
             # Repair and re-evaluate
             for ind in offspring:
-                chromosome = Chromosome(genes=ind)
-                RepairOperator.repair_timetable(chromosome, self.teachers, self.rooms)
-                if not ind.fitness.valid:
-                    ind.fitness.values = self.toolbox.evaluate(ind)
+                RepairOperator.repair_timetable(ind, self.repair_tables, self.rng)
+            invalid = [i for i, ind in enumerate(offspring) if not ind.fitness.valid]
+            self._evaluate_population([offspring[i] for i in invalid])
+            offspring_fitness[invalid] = [
+                offspring[i].fitness.values[0] for i in invalid
+            ]
 
             # Replace population
             pop[:] = offspring
+            self.fitness_arr = offspring_fitness
 
             # Track best solution
-            best = min(pop, key=lambda ind: ind.fitness.values[0])
+            best = pop[int(np.argmin(self.fitness_arr))]
             if self.config.VERBOSE:
                 print(f"Best penalty: {best.fitness.values[0]}")
 
+            # Stop early at a perfect timetable or once progress has stalled
+            best_history.append(best.fitness.values[0])
+            if best.fitness.values[0] <= 0:
+                if self.config.VERBOSE:
+                    print("Found a timetable without penalties, stopping early")
+                break
+            if (
+                len(best_history) == best_history.maxlen
+                and max(best_history) - min(best_history)
+                < self.config.EARLY_STOP_TOLERANCE
+            ):
+                if self.config.VERBOSE:
+                    print(
+                        f"Best penalty unchanged for {best_history.maxlen} generations,"
+                        " stopping early"
+                    )
+                break
+
         # Find and display final best solution
-        final_best = min(pop, key=lambda ind: ind.fitness.values[0])
+        final_best = pop[int(np.argmin(self.fitness_arr))]
         best_chromosome = Chromosome(genes=final_best)
 
         print("\n=== Final Best Timetable ===")
@@ -195,13 +383,17 @@ class TimetableScheduler:
         Args:
             chromosome (Chromosome): Best timetable chromosome
         """
+        timetable = chromosome.to_timetable()
+
         # Grid visualization for each group
         for group in self.groups:
             print(f"\nGrid for Group {group.group_id}:")
-            TimetableVisualizer.visualize_grid(chromosome, group.group_id)
+            TimetableVisualizer.visualize_grid(
+                chromosome, group.group_id, timetable=timetable
+            )
 
         # Detailed text summary
-        TimetableVisualizer.text_summary(chromosome, self.groups)
+        TimetableVisualizer.text_summary(chromosome, self.groups, timetable=timetable)
 
         # Conflict analysis
         TimetableVisualizer.conflict_analysis(chromosome)
@@ -220,7 +412,11 @@ def main():
 
     # Initialize and run scheduler
     scheduler = TimetableScheduler()
-    return scheduler.run()
+    try:
+        return scheduler.run()
+    finally:
+        if scheduler.pool is not None:
+            scheduler.pool.shutdown()
 
 
 if __name__ == "__main__":
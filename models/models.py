@@ -8,6 +8,7 @@ from sqlalchemy import (
     JSON,
     TIMESTAMP,
     UniqueConstraint,
+    Index,
     ForeignKey,
     func,
 )
@@ -94,6 +95,11 @@ class Teacher(Base):
     constraints = relationship(
         "TeacherConstraints", back_populates="teacher", uselist=False
     )
+    __table_args__ = (
+        # Serves filters on how many preferred times a teacher has, e.g.
+        # json_array_length(preferences) > 0 for teachers with preferences.
+        Index("ix_teacher_pref_count", func.json_array_length(preferences)),
+    )
 
 
 # TeacherConstraints table
@@ -228,7 +234,12 @@ class ClassAssignment(Base):
         server_default=func.current_timestamp(),
         onupdate=func.current_timestamp(),
     )
-    __table_args__ = (UniqueConstraint("teacher_id", "course_id", "group_id"),)
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "course_id", "group_id"),
+        # The unique index leads with teacher_id; this one serves lookups of
+        # a group's classes.
+        Index("ix_ca_group_course", "group_id", "course_id"),
+    )
 
 
 # For testing purposes, create the SQLite engine and tables.
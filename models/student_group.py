@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StudentGroup:
     """
     Represents a student group with unique identification and optional home room.
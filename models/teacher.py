@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List, Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Teacher:
     """
     Represents a teacher with unique identification and preferred teaching times.
@@ -1,7 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+# Canonical ordering of the school week, shared by every component that needs
+# to encode a day name as a small integer.
+DAY_INDEX = {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TimeSlot:
     """
     Represents a specific time slot in the timetable.
@@ -10,11 +14,13 @@ class TimeSlot:
         slot_id (int): Unique identifier for the time slot
         day (str): Day of the week
         period (int): Period number within the day
+        day_idx (int): The day encoded through ``DAY_INDEX``, derived from ``day``
     """
 
     slot_id: int
     day: str
     period: int
+    day_idx: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """
@@ -27,6 +33,10 @@ class TimeSlot:
         if self.period < 1:
             raise ValueError("Period must be a positive integer")
 
-        valid_days = {"Monday", "Tuesday", "Wednesday", "Thursday", "Friday"}
-        if self.day not in valid_days:
-            raise ValueError(f"Invalid day: {self.day}. Expected one of {valid_days}")
+        day_idx = DAY_INDEX.get(self.day)
+        if day_idx is None:
+            raise ValueError(
+                f"Invalid day: {self.day}. Expected one of {set(DAY_INDEX)}"
+            )
+        # The dataclass is frozen, so the derived field bypasses __setattr__.
+        object.__setattr__(self, "day_idx", day_idx)
@@ -1,8 +1,9 @@
+import itertools
 import random
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, exists, insert, select
+from sqlalchemy.orm import raiseload, selectinload, sessionmaker
 
 # Import ORM models from the same package so they all use the same Base.
 from models.models import (
@@ -12,6 +13,7 @@ from models.models import (
     Room,
     TimeSlot,
     TeacherCourseAssignment,
+    ClassAssignment,
 )
 
 from models.course import Course as CourseDC
@@ -20,17 +22,49 @@ from models.student_group import StudentGroup as StudentGroupDC
 from models.teacher import Teacher as TeacherDC
 from models.timeslot import TimeSlot as TimeSlotDC
 
-# Import conversion functions.
-from utils.converters import (
-    student_group_db_to_dc,
-    course_db_to_dc,
-    teacher_db_to_dc,
-    room_db_to_dc,
-    timeslot_db_to_dc,
+
+from faker import Faker
+
+# Column values of one table row, keyed by column name.
+Row = Dict[str, Any]
+
+# Applied to every new SQLite connection. Only per-connection settings
+# belong here: pragmas stored in the database file, such as journal_mode,
+# would rewrite the tracked timetable.db on every run.
+SQLITE_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
 )
 
 
-from faker import Faker
+# Relationships the dataclass converters read are eager-loaded; outside
+# optimized (-O) runs, any other relationship access raises instead of
+# silently issuing one query per row.
+_UNLOADED_RELATIONSHIPS = (raiseload("*"),) if __debug__ else ()
+
+
+def _teacher_from_row(teacher_id: int, name: str, preferences) -> TeacherDC:
+    return TeacherDC(
+        teacher_id=teacher_id, name=name, preferred_times=preferences or []
+    )
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+# Shared by every DataGenerator call, so repeated dataset loads reuse the
+# engine's compiled dialect and pooled, already configured connections.
+# No connection is opened until the first session needs one.
+_ENGINE = create_engine(
+    "sqlite:///timetable.db", echo=False, insertmanyvalues_page_size=10_000
+)
+event.listen(_ENGINE, "connect", _set_sqlite_pragmas)
+_Session = sessionmaker(bind=_ENGINE)
 
 
 class DataGenerator:
@@ -41,113 +75,221 @@ class DataGenerator:
 
     fake = Faker()
 
+    # Rows fetched per batch when streaming query results.
+    YIELD_PER = 1000
+
+    @staticmethod
+    def _fake_names(n: int) -> List[str]:
+        """
+        Draws ``n`` "first last" names with Faker's name frequencies.
+
+        ``Faker.name`` rebuilds the weighted name tables on every call;
+        sampling each table once for the whole batch is far cheaper.
+        """
+        fake = DataGenerator.fake
+        person = next(p for p in fake.get_providers() if hasattr(p, "first_names"))
+        first_names = fake.random_elements(
+            person.first_names, length=n, use_weighting=True
+        )
+        last_names = fake.random_elements(
+            person.last_names, length=n, use_weighting=True
+        )
+        return [f"{first} {last}" for first, last in zip(first_names, last_names)]
+
+    # Fake rows are plain column dicts, ready for executemany INSERTs. Random
+    # values are drawn one whole column per call (Faker's ``words``,
+    # ``random.choices``) rather than one provider call per row.
+
     @staticmethod
-    def create_student_groups_fake(num_groups: int = 5) -> List[StudentGroup]:
+    def create_student_groups_fake(num_groups: int = 5) -> List[Row]:
+        words = DataGenerator.fake.words(nb=num_groups)
+        years = random.choices(["2023", "2024"], k=num_groups)
+        capacities = random.choices(range(20, 51), k=num_groups)
+        group_types = random.choices(["section", "elective_group"], k=num_groups)
         return [
-            StudentGroup(
-                group_id=i + 1,
-                name=f"{DataGenerator.fake.word().capitalize()} Group {i + 1}",
-                academic_year=random.choice(["2023", "2024"]),
-                capacity=random.randint(20, 50),
-                group_type=random.choice(["section", "elective_group"]),
+            {
+                "group_id": i + 1,
+                "name": f"{word.capitalize()} Group {i + 1}",
+                "academic_year": year,
+                "capacity": capacity,
+                "group_type": group_type,
+            }
+            for i, (word, year, capacity, group_type) in enumerate(
+                zip(words, years, capacities, group_types)
             )
-            for i in range(num_groups)
         ]
 
     @staticmethod
-    def create_courses_fake(num_courses: int = 8) -> List[Course]:
-        course_names = [
-            DataGenerator.fake.word().capitalize() for _ in range(num_courses)
-        ]
+    def create_courses_fake(num_courses: int = 8) -> List[Row]:
+        words = DataGenerator.fake.words(nb=num_courses)
+        course_types = random.choices(["theory", "lab"], k=num_courses)
+        hours = random.choices(range(2, 5), k=num_courses)
         return [
-            Course(
-                course_id=i + 1,
-                code=f"C{i + 1:03d}",
-                name=course_names[i],
-                type=random.choice(["theory", "lab"]),
-                hours_per_week=random.randint(2, 4),
+            {
+                "course_id": i + 1,
+                "code": f"C{i + 1:03d}",
+                "name": word.capitalize(),
+                "type": course_type,
+                "hours_per_week": hours_per_week,
+            }
+            for i, (word, course_type, hours_per_week) in enumerate(
+                zip(words, course_types, hours)
             )
-            for i in range(num_courses)
         ]
 
     @staticmethod
-    def create_teachers_fake(num_teachers: int = 10) -> List[Teacher]:
-        teachers = []
-        for i in range(num_teachers):
-            teachers.append(
-                Teacher(
-                    teacher_id=i + 1,
-                    employee_id=f"EMP{i + 1:03d}",
-                    name=DataGenerator.fake.name(),
-                    status="active",
-                )
-            )
-        return teachers
+    def create_teachers_fake(num_teachers: int = 10) -> List[Row]:
+        names = DataGenerator._fake_names(num_teachers)
+        return [
+            {
+                "teacher_id": i + 1,
+                "employee_id": f"EMP{i + 1:03d}",
+                "name": name,
+                "status": "active",
+            }
+            for i, name in enumerate(names)
+        ]
 
     @staticmethod
-    def create_rooms_fake(num_rooms: int = 5) -> List[Room]:
+    def create_rooms_fake(num_rooms: int = 5) -> List[Row]:
+        words = DataGenerator.fake.words(nb=num_rooms)
+        capacities = random.choices(range(30, 81), k=num_rooms)
+        room_types = random.choices(
+            ["classroom", "laboratory", "lecture_hall"], k=num_rooms
+        )
         return [
-            Room(
-                room_id=i + 1,
-                name=f"Room {DataGenerator.fake.word().capitalize()} {i + 1}",
-                capacity=random.randint(30, 80),
-                room_type=random.choice(["classroom", "lab", "lecture_hall"]),
-                status="active",
+            {
+                "room_id": i + 1,
+                "name": f"Room {word.capitalize()} {i + 1}",
+                "capacity": capacity,
+                "room_type": room_type,
+                "status": "active",
+            }
+            for i, (word, capacity, room_type) in enumerate(
+                zip(words, capacities, room_types)
             )
-            for i in range(num_rooms)
         ]
 
     @staticmethod
-    def create_timeslots_fake() -> List[TimeSlot]:
+    def create_timeslots_fake() -> List[Row]:
         days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        periods = list(range(1, 7))
-        timeslots = []
-        slot_id = 1
-        for day in days:
-            for period in periods:
-                timeslots.append(TimeSlot(slot_id=slot_id, day=day, period=period))
-                slot_id += 1
-        return timeslots
+        periods = range(1, 7)
+        return [
+            {"slot_id": slot_id, "day": day, "period": period}
+            for slot_id, (day, period) in enumerate(
+                itertools.product(days, periods), start=1
+            )
+        ]
 
     @classmethod
     def populate_db(
         cls, session, num_groups=5, num_courses=8, num_teachers=10, num_rooms=5
     ):
+        """
+        Fill an empty database with fake data in a single transaction.
+
+        Every table is filled from plain row dicts with one executemany
+        INSERT, bypassing ORM object creation and unit-of-work bookkeeping.
+        Primary keys are assigned by the generators, so assignment rows can
+        reference them without reading generated ids back.
+        """
         groups = cls.create_student_groups_fake(num_groups)
         courses = cls.create_courses_fake(num_courses)
         teachers = cls.create_teachers_fake(num_teachers)
         rooms = cls.create_rooms_fake(num_rooms)
         timeslots = cls.create_timeslots_fake()
 
-        session.add_all(groups + courses + teachers + rooms + timeslots)
-        session.commit()
+        # Referenced tables first, so foreign keys resolve as rows arrive.
+        for model, rows in (
+            (Teacher, teachers),
+            (Room, rooms),
+            (StudentGroup, groups),
+            (Course, courses),
+            (TimeSlot, timeslots),
+        ):
+            session.execute(insert(model), rows)
 
         # Assign teachers to courses logically
-        for course in courses:
-            assigned_teacher = random.choice(teachers)
-            assignment = TeacherCourseAssignment(
-                course_id=course.course_id, teacher_id=assigned_teacher.teacher_id
-            )
-            session.add(assignment)
-
-        session.commit()
+        course_teacher = {
+            course["course_id"]: random.choice(teachers)["teacher_id"]
+            for course in courses
+        }
+        session.execute(
+            insert(TeacherCourseAssignment),
+            [
+                {"course_id": course_id, "teacher_id": teacher_id}
+                for course_id, teacher_id in course_teacher.items()
+            ],
+        )
 
-        # Assign student groups to courses logically
+        # Assign student groups to courses logically, taught by the course's teacher
+        class_rows = []
         for group in groups:
             assigned_courses = random.sample(courses, k=random.randint(2, 4))
             for course in assigned_courses:
-                session.add(
-                    TeacherCourseAssignment(
-                        course_id=course.course_id, student_group_id=group.group_id
-                    )
+                class_rows.append(
+                    {
+                        "course_id": course["course_id"],
+                        "teacher_id": course_teacher[course["course_id"]],
+                        "group_id": group["group_id"],
+                    }
                 )
-
+        session.execute(insert(ClassAssignment), class_rows)
         session.commit()
 
-        # Assign home rooms to student groups
-        for i, group in enumerate(groups):
-            group.home_room = rooms[i % len(rooms)].room_id
-        session.commit()
+    @classmethod
+    def _open_session(cls, num_groups, num_courses, num_teachers, num_rooms):
+        """
+        Open a session on the timetable database, populating it if empty.
+        """
+        session = _Session()
+
+        populated = session.scalar(select(exists().select_from(StudentGroup)))
+        if not populated:
+            cls.populate_db(session, num_groups, num_courses, num_teachers, num_rooms)
+        return session
+
+    @staticmethod
+    def _dataset_queries():
+        """
+        SELECT statements for groups, courses, teachers, rooms and timeslots.
+        """
+        return (
+            select(StudentGroup).options(*_UNLOADED_RELATIONSHIPS),
+            select(Course).options(*_UNLOADED_RELATIONSHIPS),
+            select(Teacher).options(
+                selectinload(Teacher.constraints), *_UNLOADED_RELATIONSHIPS
+            ),
+            select(Room).options(*_UNLOADED_RELATIONSHIPS),
+            select(TimeSlot).options(*_UNLOADED_RELATIONSHIPS),
+        )
+
+    @staticmethod
+    def _dataset_column_queries():
+        """
+        Column SELECTs for groups, courses, teachers, rooms and timeslots,
+        each paired with the callable that builds a dataclass from a row.
+
+        The SELECTs target the Core tables, so they run without the ORM
+        execution layer. Columns are listed in the order of the dataclass
+        fields, starting with the primary key. Rows are ordered by that key;
+        otherwise SQLite may answer from a covering index in that index's
+        order.
+        """
+
+        def columns(model, *names):
+            table = model.__table__
+            return select(*(table.c[name] for name in names)).order_by(
+                table.c[names[0]]
+            )
+
+        return (
+            (StudentGroupDC, columns(StudentGroup, "group_id", "name")),
+            (CourseDC, columns(Course, "course_id", "name")),
+            (_teacher_from_row, columns(Teacher, "teacher_id", "name", "preferences")),
+            (RoomDC, columns(Room, "room_id", "name")),
+            (TimeSlotDC, columns(TimeSlot, "slot_id", "day", "period")),
+        )
 
     @classmethod
     def create_complete_dataset(
@@ -156,18 +298,10 @@ class DataGenerator:
         """
         Fetch a complete dataset from the database, populating it if empty.
         """
-        engine = create_engine("sqlite:///timetable.db", echo=False)
-        Session = sessionmaker(bind=engine)
-        session = Session()
-
-        if session.query(StudentGroup).count() == 0:
-            cls.populate_db(session, num_groups, num_courses, num_teachers, num_rooms)
-
-        groups = session.query(StudentGroup).all()
-        courses = session.query(Course).all()
-        teachers = session.query(Teacher).all()
-        rooms = session.query(Room).all()
-        timeslots = session.query(TimeSlot).all()
+        session = cls._open_session(num_groups, num_courses, num_teachers, num_rooms)
+        groups, courses, teachers, rooms, timeslots = (
+            session.scalars(query).all() for query in cls._dataset_queries()
+        )
 
         session.close()
         return groups, courses, teachers, rooms, timeslots
@@ -187,18 +321,27 @@ class DataGenerator:
         List[TimeSlotDC],
     ]:
         """
-        Returns a complete dataset from the database, converting the ORM objects to your dataclasses.
+        Returns a complete dataset from the database as your dataclasses.
+
+        Only the columns the dataclasses need are selected, through Core on
+        the session's connection, and each row is turned straight into a
+        dataclass. No ORM objects are built, and no enum columns are read,
+        so no enum values are decoded. Rows are fetched in batches of
+        ``YIELD_PER``.
         """
-        groups_orm, courses_orm, teachers_orm, rooms_orm, timeslots_orm = (
-            cls.create_complete_dataset(
-                num_groups, num_courses, num_teachers, num_rooms
+        session = cls._open_session(num_groups, num_courses, num_teachers, num_rooms)
+        try:
+            connection = session.connection()
+            groups_dc, courses_dc, teachers_dc, rooms_dc, timeslots_dc = (
+                [
+                    build(*row)
+                    for row in connection.execute(
+                        query.execution_options(yield_per=cls.YIELD_PER)
+                    )
+                ]
+                for build, query in cls._dataset_column_queries()
             )
-        )
-
-        groups_dc = [student_group_db_to_dc(g) for g in groups_orm]
-        courses_dc = [course_db_to_dc(c) for c in courses_orm]
-        teachers_dc = [teacher_db_to_dc(t) for t in teachers_orm]
-        rooms_dc = [room_db_to_dc(r) for r in rooms_orm]
-        timeslots_dc = [timeslot_db_to_dc(ts) for ts in timeslots_orm]
+        finally:
+            session.close()
 
         return groups_dc, courses_dc, teachers_dc, rooms_dc, timeslots_dc
@@ -1,9 +1,201 @@
-import random
-from typing import List, Dict, Tuple
+from typing import List, NamedTuple
 
+import numpy as np
+from numba import njit
+
+from models.course import Course
 from models.teacher import Teacher
 from models.room import Room
-from genetic_algorithm.chromosome import Chromosome
+from models.timeslot import DAY_INDEX
+from genetic_algorithm.chromosome import Chromosome, GeneArrays
+from genetic_algorithm.fitness import build_teacher_pref_mask
+
+
+class RepairTables(NamedTuple):
+    """
+    Lookup tables needed to repair a chromosome, built once per dataset.
+
+    Attributes:
+        teacher_ids (np.ndarray): Ids of the available teachers, in tie-break order
+        room_ids (np.ndarray): Ids of the available rooms, in tie-break order
+        course_ids (np.ndarray): Ids of the courses clashing genes are moved to
+        teacher_pref_mask (np.ndarray): Table from ``build_teacher_pref_mask``
+    """
+
+    teacher_ids: np.ndarray
+    room_ids: np.ndarray
+    course_ids: np.ndarray
+    teacher_pref_mask: np.ndarray
+
+
+def build_repair_tables(
+    teachers: List[Teacher], rooms: List[Room], courses: List[Course], n_periods: int
+) -> RepairTables:
+    """
+    Builds every lookup table used by ``RepairOperator.repair_timetable``.
+
+    Args:
+        teachers (List[Teacher]): Available teachers
+        rooms (List[Room]): Available rooms
+        courses (List[Course]): Available courses
+        n_periods (int): Size of the period axis (highest period + 1)
+
+    Returns:
+        RepairTables: Lookup tables for repair
+    """
+    return RepairTables(
+        teacher_ids=np.array([t.teacher_id for t in teachers], dtype=np.int32),
+        room_ids=np.array([r.room_id for r in rooms], dtype=np.int32),
+        course_ids=np.array([c.course_id for c in courses], dtype=np.int32),
+        teacher_pref_mask=build_teacher_pref_mask(teachers, n_periods),
+    )
+
+
+# Preference mask for candidates without preferences (period axis of size 0).
+_NO_PREFERENCES = np.zeros((1, len(DAY_INDEX), 0), dtype=bool)
+
+
+@njit(cache=True, fastmath=False)
+def _candidate_index(ids, candidate_ids):
+    """
+    Maps ids to their position in ``candidate_ids``; other ids map to -1.
+    """
+    size = ids.max() + 1
+    if candidate_ids.shape[0]:
+        size = max(size, candidate_ids.max() + 1)
+    candidate_of = np.full(size, -1, np.int64)
+    for c in range(candidate_ids.shape[0]):
+        candidate_of[candidate_ids[c]] = c
+    return candidate_of
+
+
+@njit(cache=True, fastmath=False, inline="always")
+def _pick_candidate(used_row, load, candidate_ids, preferred, d, p):
+    """
+    Picks the least reassigned candidate that is free in a slot.
+
+    Candidates whose ``preferred[id, day, period]`` is set are favoured and
+    ties go to the earliest candidate.
+
+    Returns:
+        int: Index into ``candidate_ids``, or -1 if every candidate is used
+    """
+    best = -1
+    best_preferred = False
+    preferred_periods = preferred.shape[2]
+    for c in range(candidate_ids.shape[0]):
+        if used_row[c]:
+            continue
+        is_preferred = p < preferred_periods and preferred[candidate_ids[c], d, p]
+        if (
+            best < 0
+            or (is_preferred and not best_preferred)
+            or (is_preferred == best_preferred and load[c] < load[best])
+        ):
+            best = c
+            best_preferred = is_preferred
+    return best
+
+
+@njit(cache=True, fastmath=False)
+def _reassign_conflicts(ids, day_idx, periods, candidate_ids, preferred, n_days):
+    """
+    Reassigns genes whose id is already taken in their slot, in place.
+
+    Genes are visited in order. A gene clashes when an earlier gene of the
+    same (day, period) slot holds its id, taking earlier reassignments into
+    account; it is then moved to the candidate chosen by
+    ``_pick_candidate``.
+
+    Args:
+        ids: Id of each gene, one of ``candidate_ids``
+        day_idx: Day of each gene
+        periods: Period of each gene
+        candidate_ids: Ids genes may be moved to, in tie-break order
+        preferred: Id-indexed preference mask; periods beyond its last axis
+            are not preferred
+        n_days: Size of the day axis
+
+    Returns:
+        bool: Whether any gene was reassigned
+    """
+    n_genes = ids.shape[0]
+    n_candidates = candidate_ids.shape[0]
+    if n_genes == 0 or n_candidates == 0:
+        return False
+
+    n_periods = periods.max() + 1
+    candidate_of = _candidate_index(ids, candidate_ids)
+    used = np.zeros((n_days * n_periods, n_candidates), np.bool_)
+    load = np.zeros(n_candidates, np.int64)
+
+    changed = False
+    for i in range(n_genes):
+        d = day_idx[i]
+        p = periods[i]
+        slot = d * n_periods + p
+        current = candidate_of[ids[i]]
+        if used[slot, current]:
+            best = _pick_candidate(used[slot], load, candidate_ids, preferred, d, p)
+            if best >= 0:
+                ids[i] = candidate_ids[best]
+                load[best] += 1
+                current = best
+                changed = True
+        used[slot, current] = True
+    return changed
+
+
+@njit(cache=True, fastmath=False)
+def _group_duplicates(group_ids, day_idx, periods, n_days):
+    """
+    Flags every gene after the first of its (group, day, period) slot.
+    """
+    n_genes = group_ids.shape[0]
+    duplicate = np.zeros(n_genes, np.bool_)
+    if n_genes == 0:
+        return duplicate
+
+    n_periods = periods.max() + 1
+    used = np.zeros((group_ids.max() + 1, n_days * n_periods), np.bool_)
+    for i in range(n_genes):
+        slot = day_idx[i] * n_periods + periods[i]
+        duplicate[i] = used[group_ids[i], slot]
+        used[group_ids[i], slot] = True
+    return duplicate
+
+
+@njit(cache=True, fastmath=False)
+def _repair_all(
+    teacher_ids,
+    room_ids,
+    group_ids,
+    day_idx,
+    periods,
+    teacher_candidates,
+    teacher_preferred,
+    room_candidates,
+    room_preferred,
+    n_days,
+):
+    """
+    Runs the teacher, room and group passes in one compiled call.
+
+    The passes read and write disjoint arrays. Each pass still has its own
+    loop over the genes; interleaving them per gene measured slower.
+
+    Returns:
+        Tuple[bool, np.ndarray]: Whether any teacher or room was reassigned,
+        and the mask from ``_group_duplicates``
+    """
+    teachers_changed = _reassign_conflicts(
+        teacher_ids, day_idx, periods, teacher_candidates, teacher_preferred, n_days
+    )
+    rooms_changed = _reassign_conflicts(
+        room_ids, day_idx, periods, room_candidates, room_preferred, n_days
+    )
+    duplicate = _group_duplicates(group_ids, day_idx, periods, n_days)
+    return teachers_changed or rooms_changed, duplicate
 
 
 class RepairOperator:
@@ -14,139 +206,137 @@ class RepairOperator:
 
     @classmethod
     def repair_timetable(
-        cls, individual: Chromosome, teachers: List[Teacher], rooms: List[Room]
+        cls,
+        individual: Chromosome,
+        tables: RepairTables,
+        rng: np.random.Generator,
     ) -> Chromosome:
         """
         Apply repair heuristics to resolve conflicts in the timetable.
 
         Args:
             individual (Chromosome): Chromosome to be repaired
-            teachers (List[Teacher]): Available teachers
-            rooms (List[Room]): Available rooms
+            tables (RepairTables): Lookup tables from ``build_repair_tables``
+            rng (np.random.Generator): Random number generator
 
         Returns:
             Chromosome: Repaired chromosome
         """
-        # Repair strategies applied in sequence
-        individual = cls._resolve_teacher_conflicts(individual, teachers)
-        individual = cls._resolve_room_conflicts(individual, rooms)
-        individual = cls._resolve_group_conflicts(individual)
+        # The teacher, room and group strategies run in one compiled call;
+        # the result matches applying the _resolve_* methods in that order.
+        arrays = individual.as_arrays()
+        changed, duplicate = _repair_all(
+            arrays.teacher_ids,
+            arrays.room_ids,
+            arrays.group_ids,
+            arrays.day_idx,
+            arrays.periods,
+            tables.teacher_ids,
+            tables.teacher_pref_mask,
+            tables.room_ids,
+            _NO_PREFERENCES,
+            len(DAY_INDEX),
+        )
+        if cls._replace_duplicate_courses(arrays, duplicate, tables, rng):
+            changed = True
+        if changed:
+            individual.mark_modified()
 
         return individual
 
     @classmethod
     def _resolve_teacher_conflicts(
-        cls, individual: Chromosome, teachers: List[Teacher]
+        cls, individual: Chromosome, tables: RepairTables
     ) -> Chromosome:
         """
         Resolve teacher scheduling conflicts.
 
         Args:
             individual (Chromosome): Chromosome to repair
-            teachers (List[Teacher]): Available teachers
+            tables (RepairTables): Lookup tables from ``build_repair_tables``
 
         Returns:
             Chromosome: Chromosome with teacher conflicts resolved
         """
-        teacher_schedule: Dict[Tuple[str, int], List[int]] = {}
-        teacher_load: Dict[int, int] = {t.teacher_id: 0 for t in teachers}
-        teacher_preferences: Dict[int, List[Tuple[str, int]]] = {
-            t.teacher_id: t.preferred_times for t in teachers
-        }
-
-        for gene in individual.genes:
-            key = (gene.day, gene.period)
-            teacher_schedule.setdefault(key, [])
-
-            if gene.teacher_id in teacher_schedule[key]:
-                # Find alternative teachers
-                available_teachers = [
-                    t.teacher_id
-                    for t in teachers
-                    if t.teacher_id not in teacher_schedule[key]
-                ]
-
-                if available_teachers:
-                    # Prioritize teachers with preferred times
-                    preferred_available = [
-                        tid
-                        for tid in available_teachers
-                        if key in teacher_preferences.get(tid, [])
-                    ]
-
-                    # Choose teacher with least load
-                    best_teacher = min(
-                        preferred_available or available_teachers,
-                        key=lambda tid: teacher_load[tid],
-                    )
-
-                    gene.teacher_id = best_teacher
-                    teacher_load[best_teacher] += 1
-
-            teacher_schedule[key].append(gene.teacher_id)
-
+        arrays = individual.as_arrays()
+        if _reassign_conflicts(
+            arrays.teacher_ids,
+            arrays.day_idx,
+            arrays.periods,
+            tables.teacher_ids,
+            tables.teacher_pref_mask,
+            len(DAY_INDEX),
+        ):
+            individual.mark_modified()
         return individual
 
     @classmethod
     def _resolve_room_conflicts(
-        cls, individual: Chromosome, rooms: List[Room]
+        cls, individual: Chromosome, tables: RepairTables
     ) -> Chromosome:
         """
         Resolve room scheduling conflicts.
 
         Args:
             individual (Chromosome): Chromosome to repair
-            rooms (List[Room]): Available rooms
+            tables (RepairTables): Lookup tables from ``build_repair_tables``
 
         Returns:
             Chromosome: Chromosome with room conflicts resolved
         """
-        room_schedule: Dict[Tuple[str, int], List[int]] = {}
-        room_usage: Dict[int, int] = {r.room_id: 0 for r in rooms}
-
-        for gene in individual.genes:
-            key = (gene.day, gene.period)
-            room_schedule.setdefault(key, [])
-
-            if gene.room_id in room_schedule[key]:
-                # Find alternative rooms
-                available_rooms = [
-                    r.room_id for r in rooms if r.room_id not in room_schedule[key]
-                ]
-
-                if available_rooms:
-                    # Choose room with least usage
-                    best_room = min(available_rooms, key=lambda rid: room_usage[rid])
-
-                    gene.room_id = best_room
-                    room_usage[best_room] += 1
-
-            room_schedule[key].append(gene.room_id)
-
+        arrays = individual.as_arrays()
+        if _reassign_conflicts(
+            arrays.room_ids,
+            arrays.day_idx,
+            arrays.periods,
+            tables.room_ids,
+            _NO_PREFERENCES,
+            len(DAY_INDEX),
+        ):
+            individual.mark_modified()
         return individual
 
     @classmethod
-    def _resolve_group_conflicts(cls, individual: Chromosome) -> Chromosome:
+    def _resolve_group_conflicts(
+        cls, individual: Chromosome, tables: RepairTables, rng: np.random.Generator
+    ) -> Chromosome:
         """
         Resolve student group scheduling conflicts.
 
+        Every gene after the first of its (group, day, period) slot gets a
+        random course from ``tables.course_ids``.
+
         Args:
             individual (Chromosome): Chromosome to repair
+            tables (RepairTables): Lookup tables from ``build_repair_tables``
+            rng (np.random.Generator): Random number generator
 
         Returns:
             Chromosome: Chromosome with group conflicts resolved
         """
-        group_schedule: Dict[Tuple[int, str, int], bool] = {}
-
-        for gene in individual.genes:
-            key = (gene.group_id, gene.day, gene.period)
-
-            if key in group_schedule:
-                # If conflict exists, randomly change course
-                gene.course_id = random.randint(
-                    1, 3
-                )  # Assumes courses are numbered 1-3
+        arrays = individual.as_arrays()
+        duplicate = _group_duplicates(
+            arrays.group_ids, arrays.day_idx, arrays.periods, len(DAY_INDEX)
+        )
+        if cls._replace_duplicate_courses(arrays, duplicate, tables, rng):
+            individual.mark_modified()
+        return individual
 
-            group_schedule[key] = True
+    @staticmethod
+    def _replace_duplicate_courses(
+        arrays: GeneArrays,
+        duplicate: np.ndarray,
+        tables: RepairTables,
+        rng: np.random.Generator,
+    ) -> bool:
+        """
+        Gives every flagged gene a random course from ``tables.course_ids``.
 
-        return individual
+        Returns:
+            bool: Whether any course was replaced
+        """
+        n_duplicates = np.count_nonzero(duplicate)
+        if not n_duplicates or not tables.course_ids.size:
+            return False
+        arrays.course_ids[duplicate] = rng.choice(tables.course_ids, size=n_duplicates)
+        return True
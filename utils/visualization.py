@@ -1,10 +1,80 @@
-from typing import List, Optional
-from tabulate import tabulate
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from genetic_algorithm.chromosome import Chromosome
+import numpy as np
+from numba import njit
+
+from genetic_algorithm.chromosome import DAYS, Chromosome, GeneArrays, Timetable
 from models.student_group import StudentGroup
 
 
+@lru_cache(maxsize=8)
+def _grid_headers(periods: Tuple[int, ...]) -> Tuple[str, ...]:
+    """
+    Builds the header row of ``visualize_grid``, cached for repeated redraws.
+    """
+    return ("Day/Period", *(f"Period {p}" for p in periods))
+
+
+@njit(cache=True, fastmath=False)
+def _count_conflicts(teacher_ids, room_ids, group_ids, day_idx, periods, n_days):
+    """
+    Finds the teacher, room and group slots holding more than one gene.
+
+    Occupancy of all three kinds is counted in one loop over the genes, in
+    dense buffers indexed by packed (id, day, period) keys. A second loop
+    reports each overbooked slot at its first gene.
+
+    Args:
+        teacher_ids: Teacher of each gene
+        room_ids: Room of each gene
+        group_ids: Student group of each gene
+        day_idx: Day of each gene
+        periods: Period of each gene
+        n_days: Size of the day axis
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Per kind (teachers,
+        rooms, groups), the number of overbooked slots; in the first that
+        many entries of each row, the index of each slot's first gene, in
+        gene order; and the slot's gene count
+    """
+    n_genes = periods.shape[0]
+    n_periods = periods.max() + 1
+    n_slots = n_days * n_periods
+    teacher_slots = np.zeros((teacher_ids.max() + 1) * n_slots, np.int32)
+    room_slots = np.zeros((room_ids.max() + 1) * n_slots, np.int32)
+    group_slots = np.zeros((group_ids.max() + 1) * n_slots, np.int32)
+    for i in range(n_genes):
+        slot = day_idx[i] * n_periods + periods[i]
+        teacher_slots[teacher_ids[i] * n_slots + slot] += 1
+        room_slots[room_ids[i] * n_slots + slot] += 1
+        group_slots[group_ids[i] * n_slots + slot] += 1
+
+    n_found = np.zeros(3, np.int64)
+    first_genes = np.empty((3, n_genes), np.int64)
+    counts = np.empty((3, n_genes), np.int32)
+    for i in range(n_genes):
+        slot = day_idx[i] * n_periods + periods[i]
+        for kind in range(3):
+            if kind == 0:
+                slot_counts = teacher_slots
+                key = teacher_ids[i] * n_slots + slot
+            elif kind == 1:
+                slot_counts = room_slots
+                key = room_ids[i] * n_slots + slot
+            else:
+                slot_counts = group_slots
+                key = group_ids[i] * n_slots + slot
+            if slot_counts[key] > 1:
+                first_genes[kind, n_found[kind]] = i
+                counts[kind, n_found[kind]] = slot_counts[key]
+                n_found[kind] += 1
+                # Report the slot only once.
+                slot_counts[key] = 0
+    return n_found, first_genes, counts
+
+
 class TimetableVisualizer:
     """
     Utility class for visualizing timetables in various formats.
@@ -17,6 +87,7 @@ class TimetableVisualizer:
         group_id: int,
         days: Optional[List[str]] = None,
         periods: Optional[List[int]] = None,
+        timetable: Optional[Timetable] = None,
     ) -> None:
         """
         Visualizes the timetable for a given student group in a grid format.
@@ -28,29 +99,34 @@ class TimetableVisualizer:
                 Defaults to standard school week.
             periods (Optional[List[int]], optional): Periods to display.
                 Defaults to periods 1-3.
+            timetable (Optional[Timetable], optional): The chromosome's
+                ``to_timetable()``, for callers that already have it.
         """
         # Default values if not provided
         days = days or ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
         periods = periods or [1, 2, 3, 4, 5, 6]
 
         # Get timetable for specific group
-        timetable = chromosome.to_timetable()
+        if timetable is None:
+            timetable = chromosome.to_timetable(group_filter=group_id)
         group_timetable = timetable.get(group_id, {})
 
-        # Prepare table headers
-        headers = ["Day/Period"] + [f"Period {p}" for p in periods]
+        headers = _grid_headers(tuple(periods))
         table = []
 
+        # Each day's genes go into a period-indexed list; as with the former
+        # dict, a later gene of a period replaces an earlier one.
+        n_cells = max(periods) + 1
         for day in days:
             row = [day]
-            day_genes = group_timetable.get(day, [])
-
-            # Create mapping from period to gene
-            period_to_gene = {gene.period: gene for gene in day_genes}
+            period_to_gene = [None] * n_cells
+            for gene in group_timetable.get(day, []):
+                if gene.period < n_cells:
+                    period_to_gene[gene.period] = gene
 
             for p in periods:
-                if p in period_to_gene:
-                    gene = period_to_gene[p]
+                gene = period_to_gene[p]
+                if gene is not None:
                     cell_content = (
                         f"C{gene.course_id} T{gene.teacher_id} R{gene.room_id}"
                     )
@@ -60,32 +136,159 @@ class TimetableVisualizer:
 
             table.append(row)
 
-        print(tabulate(table, headers=headers, tablefmt="grid"))
+        print(cls._render_grid(headers, table))
+
+    @staticmethod
+    def _render_grid(headers: Tuple[str, ...], rows: List[List[str]]) -> str:
+        """
+        Renders text cells as a table in the layout of tabulate's "grid" format.
+
+        Every column is left-aligned and as wide as its longest cell, but at
+        least two characters wider than its header.
+
+        Args:
+            headers (Tuple[str, ...]): Column headers
+            rows (List[List[str]]): Table rows, one cell per header
+
+        Returns:
+            str: Rendered table
+        """
+        widths = [len(header) + 2 for header in headers]
+        for row in rows:
+            widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+
+        def line(fill: str) -> str:
+            return "+" + "+".join(fill * (width + 2) for width in widths) + "+"
+
+        def cells(values: List[str]) -> str:
+            padded = (value.ljust(width) for value, width in zip(values, widths))
+            return "| " + " | ".join(padded) + " |"
+
+        rule = line("-")
+        lines = [rule, cells(headers), line("=")]
+        for row in rows:
+            lines.append(cells(row))
+            lines.append(rule)
+        if not rows:
+            lines.append(rule)
+        return "\n".join(lines)
 
     @classmethod
-    def text_summary(cls, chromosome: Chromosome, groups: List[StudentGroup]) -> None:
+    def text_summary(
+        cls,
+        chromosome: Chromosome,
+        groups: List[StudentGroup],
+        timetable: Optional[Timetable] = None,
+    ) -> None:
         """
         Generates a text summary of the timetable for all groups.
 
         Args:
             chromosome (Chromosome): Chromosome containing the timetable
             groups (List[StudentGroup]): List of student groups
+            timetable (Optional[Timetable], optional): The chromosome's
+                ``to_timetable()``, for callers that already have it.
         """
+        if timetable is None:
+            timetable = chromosome.to_timetable()
+
+        # The summary is collected and printed in one call rather than one
+        # print per line.
+        lines = []
         for group in groups:
-            print(f"\n===== Timetable for {group.name} (ID: {group.group_id}) =====")
+            lines.append(
+                f"\n===== Timetable for {group.name} (ID: {group.group_id}) ====="
+            )
 
-            timetable = chromosome.to_timetable().get(group.group_id, {})
+            group_timetable = timetable.get(group.group_id, {})
 
-            for day, genes in sorted(timetable.items()):
-                print(f"\n{day}:")
-                for gene in sorted(genes, key=lambda g: g.period):
-                    print(
+            # Week order; sorting the day names would list Friday first.
+            for day in DAYS:
+                genes = group_timetable.get(day)
+                if genes is None:
+                    continue
+                lines.append(f"\n{day}:")
+                # to_timetable already orders each day's genes by period.
+                for gene in genes:
+                    lines.append(
                         f"  Period {gene.period}: "
                         f"Course {gene.course_id}, "
                         f"Teacher {gene.teacher_id}, "
                         f"Room {gene.room_id}"
                     )
 
+        if lines:
+            print("\n".join(lines))
+
+    @staticmethod
+    def _overbooked_slots(
+        arrays: GeneArrays,
+    ) -> Tuple[Dict[Tuple[int, str, int], int], ...]:
+        """
+        Counts the genes of every overbooked teacher, room and group slot.
+
+        The counting is done by one call of the Numba-compiled
+        ``_count_conflicts``.
+
+        Args:
+            arrays (GeneArrays): Gene arrays of the chromosome
+
+        Returns:
+            Tuple[Dict[Tuple[int, str, int], int], ...]: For teachers, rooms
+            and groups, the gene count per (id, day name, period) slot
+            holding more than one gene, in order of each slot's first gene
+        """
+        id_columns = (arrays.teacher_ids, arrays.room_ids, arrays.group_ids)
+        if len(arrays.periods) < 2:
+            # A conflict needs two genes.
+            return tuple({} for _ in id_columns)
+
+        n_found, first_genes, counts = _count_conflicts(
+            *id_columns, arrays.day_idx, arrays.periods, len(DAYS)
+        )
+        conflicts = []
+        for kind, ids in enumerate(id_columns):
+            genes = first_genes[kind, : n_found[kind]]
+            conflicts.append(
+                {
+                    (slot_id, DAYS[day], period): count
+                    for slot_id, day, period, count in zip(
+                        ids[genes].tolist(),
+                        arrays.day_idx[genes].tolist(),
+                        arrays.periods[genes].tolist(),
+                        counts[kind, : n_found[kind]].tolist(),
+                    )
+                }
+            )
+        return tuple(conflicts)
+
+    @staticmethod
+    def has_conflicts(chromosome: Chromosome) -> bool:
+        """
+        Checks whether any teacher, room or group is booked twice for a slot.
+
+        Uses the same ``_count_conflicts`` scan as ``conflict_analysis``,
+        but skips building the conflict dicts.
+
+        Args:
+            chromosome (Chromosome): Chromosome to check
+
+        Returns:
+            bool: True if the timetable has at least one conflict
+        """
+        arrays = chromosome.as_arrays()
+        if len(arrays.periods) < 2:
+            return False
+        n_found, _, _ = _count_conflicts(
+            arrays.teacher_ids,
+            arrays.room_ids,
+            arrays.group_ids,
+            arrays.day_idx,
+            arrays.periods,
+            len(DAYS),
+        )
+        return bool(n_found.any())
+
     @classmethod
     def conflict_analysis(cls, chromosome: Chromosome) -> None:
         """
@@ -94,27 +297,13 @@ class TimetableVisualizer:
         Args:
             chromosome (Chromosome): Chromosome to analyze
         """
-        teacher_conflicts = {}
-        room_conflicts = {}
-        group_conflicts = {}
-
-        for gene in chromosome.genes:
-            # Track teacher conflicts
-            teacher_key = (gene.teacher_id, gene.day, gene.period)
-            teacher_conflicts[teacher_key] = teacher_conflicts.get(teacher_key, 0) + 1
-
-            # Track room conflicts
-            room_key = (gene.room_id, gene.day, gene.period)
-            room_conflicts[room_key] = room_conflicts.get(room_key, 0) + 1
-
-            # Track group conflicts
-            group_key = (gene.group_id, gene.day, gene.period)
-            group_conflicts[group_key] = group_conflicts.get(group_key, 0) + 1
+        teacher_conflicts, room_conflicts, group_conflicts = cls._overbooked_slots(
+            chromosome.as_arrays()
+        )
 
         print("\n=== Conflict Analysis ===")
 
         # Report teacher conflicts
-        teacher_conflicts = {k: v for k, v in teacher_conflicts.items() if v > 1}
         if teacher_conflicts:
             print("\nTeacher Conflicts:")
             for (teacher_id, day, period), count in teacher_conflicts.items():
@@ -123,7 +312,6 @@ class TimetableVisualizer:
                 )
 
         # Report room conflicts
-        room_conflicts = {k: v for k, v in room_conflicts.items() if v > 1}
         if room_conflicts:
             print("\nRoom Conflicts:")
             for (room_id, day, period), count in room_conflicts.items():
@@ -132,7 +320,6 @@ class TimetableVisualizer:
                 )
 
         # Report group conflicts
-        group_conflicts = {k: v for k, v in group_conflicts.items() if v > 1}
         if group_conflicts:
             print("\nGroup Conflicts:")
             for (group_id, day, period), count in group_conflicts.items():